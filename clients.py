@@ -0,0 +1,77 @@
+"""
+Shared Azure OpenAI chat clients for the tutorials.
+
+Every tutorial asks this module for its chat client instead of constructing
+its own, so tutorials and examples running in the same process reuse one
+token lookup and one HTTP connection pool per client type, endpoint and
+deployment.
+
+build_agent() creates an agent on the shared chat client using the
+endpoint and deployment from config.CONFIG.
+
+Call close_chat_clients() before the event loop shuts down to release the
+pooled connections.
+"""
+
+from agent_framework import ChatAgent
+from agent_framework.azure import AzureOpenAIChatClient, AzureOpenAIResponsesClient
+from azure.identity import DefaultAzureCredential
+from config import CONFIG
+from credentials import CREDENTIAL_OPTIONS
+
+# Chat clients keyed by (client class, endpoint, deployment)
+_chat_clients: dict[tuple[type, str, str], AzureOpenAIChatClient | AzureOpenAIResponsesClient] = {}
+
+
+def _create_credential() -> DefaultAzureCredential:
+    """Create the credential used to authenticate against Azure OpenAI."""
+    return DefaultAzureCredential(**CREDENTIAL_OPTIONS)
+
+
+def _get_client(client_class, endpoint: str, deployment: str):
+    """Return the shared client of the given class, creating it on first use."""
+    key = (client_class, endpoint, deployment)
+    client = _chat_clients.get(key)
+
+    if client is None:
+        # The credential is only needed to fetch the token while the client is built
+        with _create_credential() as credential:
+            client = client_class(
+                endpoint=endpoint,
+                deployment_name=deployment,
+                credential=credential
+            )
+        _chat_clients[key] = client
+
+    return client
+
+
+def get_chat_client(endpoint: str, deployment: str) -> AzureOpenAIChatClient:
+    """Return the shared chat client for the given endpoint and deployment."""
+    return _get_client(AzureOpenAIChatClient, endpoint, deployment)
+
+
+def get_responses_client(endpoint: str, deployment: str) -> AzureOpenAIResponsesClient:
+    """
+    Return the shared Responses API client for the given endpoint and deployment.
+
+    Unlike the chat completions client, it can keep conversations on the
+    service: agents created with store=True get server-side threads, so
+    each turn only sends the new messages instead of the whole history.
+    """
+    return _get_client(AzureOpenAIResponsesClient, endpoint, deployment)
+
+
+def build_agent(instructions: str, name: str) -> ChatAgent:
+    """Create an agent on the shared chat client for the configured deployment."""
+    return get_chat_client(CONFIG.endpoint, CONFIG.deployment).create_agent(
+        instructions=instructions,
+        name=name
+    )
+
+
+async def close_chat_clients() -> None:
+    """Close the HTTP connection pools of all shared chat clients."""
+    while _chat_clients:
+        _, client = _chat_clients.popitem()
+        await client.client.close()
@@ -0,0 +1,42 @@
+"""
+Shared Azure OpenAI configuration for the tutorials.
+
+The .env file is loaded and the required settings are validated once, when
+this module is first imported, so every tutorial reads the same values
+instead of looking them up again in each example.
+
+Required environment variables:
+- AZURE_OPENAI_ENDPOINT (e.g., https://your-resource.openai.azure.com)
+- AZURE_OPENAI_CHAT_DEPLOYMENT_NAME
+"""
+
+import os
+from dataclasses import dataclass
+from env_boot import boot
+
+# Load environment variables from .env file
+boot()
+
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Azure OpenAI settings shared by the tutorials."""
+
+    endpoint: str
+    deployment: str
+
+
+def _load_config() -> Config:
+    """Read and validate the Azure OpenAI settings from the environment."""
+    endpoint = os.environ.get("AZURE_OPENAI_ENDPOINT")
+    deployment = os.environ.get("AZURE_OPENAI_CHAT_DEPLOYMENT_NAME")
+
+    if not endpoint or not deployment:
+        raise RuntimeError(
+            "Please set AZURE_OPENAI_ENDPOINT and AZURE_OPENAI_CHAT_DEPLOYMENT_NAME in .env file"
+        )
+
+    return Config(endpoint=endpoint, deployment=deployment)
+
+
+CONFIG = _load_config()
@@ -0,0 +1,16 @@
+"""
+Shared DefaultAzureCredential settings for the samples.
+
+Both the sync credential in clients.py and the async one in main.py are
+created with these options, so every entry point tries the same sources.
+"""
+
+# Environment and managed identity credentials are tried first, so CI and
+# hosted runs read a token directly instead of spawning the az CLI, which
+# stays available as the fallback after 'az login' for local development.
+# Interactive and IDE-cached sources are skipped.
+CREDENTIAL_OPTIONS = {
+    "exclude_interactive_browser_credential": True,
+    "exclude_visual_studio_code_credential": True,
+    "exclude_shared_token_cache_credential": True,
+}
@@ -0,0 +1,16 @@
+"""
+One-time loading of the project's .env file.
+
+Every tutorial and shared module calls boot() instead of load_dotenv(), so
+the .env file is parsed once per process no matter how many of them are
+imported together.
+"""
+
+from functools import cache
+from dotenv import load_dotenv
+
+
+@cache
+def boot() -> None:
+    """Load environment variables from the .env file, on the first call only."""
+    load_dotenv()
@@ -1,12 +1,11 @@
 import asyncio
-import os
 from agent_framework import ChatAgent
-from agent_framework.azure import AzureAIAgentClient
-from azure.identity.aio import AzureCliCredential
-from dotenv import load_dotenv
+from azure.identity.aio import DefaultAzureCredential
+from credentials import CREDENTIAL_OPTIONS
+from env_boot import boot
 
 # Load environment variables from .env file
-load_dotenv()
+boot()
 
 
 async def main():
@@ -19,26 +18,30 @@ async def main():
     Prerequisites:
     - Set AZURE_AI_PROJECT_ENDPOINT environment variable
     - Set AZURE_AI_MODEL_DEPLOYMENT_NAME environment variable
-    - Run 'az login' to authenticate with Azure CLI
+    - Run 'az login' to authenticate with Azure CLI (or provide environment or
+      managed identity credentials, which DefaultAzureCredential tries first)
     """
-    # Get environment variables
-    endpoint = os.getenv("AZURE_AI_PROJECT_ENDPOINT")
-    model_deployment = os.getenv("AZURE_AI_MODEL_DEPLOYMENT_NAME")
-    
+    # Imported here so that importing this module stays cheap; the client
+    # reads AZURE_AI_PROJECT_ENDPOINT and AZURE_AI_MODEL_DEPLOYMENT_NAME itself
+    from agent_framework.azure import AzureAIAgentClient
+
     print(" ")
     print("***********************************************************************")
     print(" ")
 
 
     async with (
-        AzureCliCredential() as credential,
+        DefaultAzureCredential(**CREDENTIAL_OPTIONS) as credential,
         ChatAgent(
             chat_client=AzureAIAgentClient(async_credential=credential),
             instructions="You are good at telling stories."
         ) as agent,
     ):
-        result = await agent.run("Tell me a story about a pirate.")
-        print(result.text)
+        # Stream the story so it prints as soon as the first tokens arrive
+        async for update in agent.run_stream("Tell me a story about a pirate."):
+            if update.text:
+                print(update.text, end="", flush=True)
+        print()  # New line after streaming is complete
 
 
 if __name__ == "__main__":
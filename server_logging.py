@@ -0,0 +1,52 @@
+"""
+Queue-based logging for the MCP server tutorials.
+
+Log calls on the event loop thread only put the record on a queue; a
+background listener thread formats it and writes it to stderr. Writing to
+stderr also keeps stdout free for the MCP stdio transport.
+"""
+
+import atexit
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+
+# The listener of this process, once logging has been set up
+_listener: QueueListener | None = None
+
+
+def setup_queue_logging(level: int = logging.WARNING) -> QueueListener:
+    """
+    Send all log records through a queue to a background stderr writer.
+
+    The root level defaults to WARNING so that per-request INFO logs from
+    libraries such as httpx stay off; the tutorials raise their own loggers
+    to INFO.
+
+    Calling it again in the same process returns the running listener, so
+    both the launcher and each server worker can call it.
+    """
+    global _listener
+
+    if _listener is not None:
+        return _listener
+
+    log_queue = queue.SimpleQueue()
+
+    stderr_handler = logging.StreamHandler(sys.stderr)
+    stderr_handler.setFormatter(logging.Formatter("%(message)s"))
+
+    listener = QueueListener(log_queue, stderr_handler)
+    listener.start()
+    # Flush whatever is still queued when the process exits
+    atexit.register(listener.stop)
+
+    # force=True replaces the direct stderr handler that agent_framework
+    # installs on the root logger when it is imported
+    logging.basicConfig(
+        level=level, format="%(message)s", handlers=[QueueHandler(log_queue)], force=True
+    )
+
+    _listener = listener
+    return listener
@@ -13,13 +13,7 @@ Prerequisites:
 """
 
 import asyncio
-import os
-from agent_framework.azure import AzureOpenAIChatClient
-from azure.identity import AzureCliCredential
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
+from clients import build_agent, close_chat_clients
 
 
 async def main():
@@ -29,27 +23,15 @@ async def main():
     The agent will return a response object, and accessing the .text property
     provides the text result from the agent.
     """
-    # Get environment variables
-    endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
-    deployment_name = os.getenv("AZURE_OPENAI_CHAT_DEPLOYMENT_NAME")
-
-    if not endpoint or not deployment_name:
-        print("Error: Please set AZURE_OPENAI_ENDPOINT and AZURE_OPENAI_CHAT_DEPLOYMENT_NAME in .env file")
-        return
-
     # Create the agent
-    agent = AzureOpenAIChatClient(
-        endpoint=endpoint,
-        deployment_name=deployment_name,
-        credential=AzureCliCredential()
-    ).create_agent(
-        instructions="You are good at telling jokes.",
-        name="Joker"
-    )
-
-    # Run the agent with a simple string input
-    result = await agent.run("Tell me a joke about a pirate.")
-    print(result.text)
+    agent = build_agent("You are good at telling jokes.", "Joker")
+
+    try:
+        # Run the agent with a simple string input
+        result = await agent.run("Tell me a joke about a pirate.")
+        print(result.text)
+    finally:
+        await close_chat_clients()
 
 
 if __name__ == "__main__":
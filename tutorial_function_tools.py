@@ -11,6 +11,7 @@ Key Concepts:
 - Use type annotations with Annotated and Pydantic's Field to provide descriptions
 - You can use the @ai_function decorator to explicitly specify function metadata
 - Multiple related functions can be organized in a class
+- Function tools can be async so that I/O inside them doesn't block the event loop
 
 Prerequisites:
 - Set AZURE_OPENAI_ENDPOINT environment variable (e.g., https://your-resource.openai.azure.com)
@@ -19,26 +20,23 @@ Prerequisites:
 """
 
 import asyncio
-import os
+from contextvars import ContextVar
 from typing import Annotated
 from pydantic import Field
 from agent_framework.azure import AzureOpenAIChatClient
 from agent_framework import ai_function
-from azure.identity import AzureCliCredential
-from dotenv import load_dotenv
+from clients import close_chat_clients, get_chat_client
+from config import CONFIG
 
-# Load environment variables from .env file
-load_dotenv()
 
-
-def get_weather(
+async def get_weather(
     location: Annotated[str, Field(description="The location to get the weather for.")],
 ) -> str:
     """Get the weather for a given location."""
     return f"The weather in {location} is cloudy with a high of 15°C."
 
 
-async def simple_function_tool():
+async def simple_function_tool(client: AzureOpenAIChatClient) -> list[str]:
     """
     Example 1: Simple function tool
     
@@ -46,148 +44,169 @@ async def simple_function_tool():
     can call when needed. The function uses type annotations to provide
     descriptions to the agent.
     """
-    print("=" * 70)
-    print("EXAMPLE 1: Simple Function Tool")
-    print("=" * 70)
-    
-    # Get environment variables
-    endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
-    deployment_name = os.getenv("AZURE_OPENAI_CHAT_DEPLOYMENT_NAME")
-    
-    if not endpoint or not deployment_name:
-        print("Error: Please set AZURE_OPENAI_ENDPOINT and AZURE_OPENAI_CHAT_DEPLOYMENT_NAME in .env file")
-        return
+    lines = []
+    lines.append("=" * 70)
+    lines.append("EXAMPLE 1: Simple Function Tool")
+    lines.append("=" * 70)
     
     # Create the agent with the function tool
-    agent = AzureOpenAIChatClient(
-        endpoint=endpoint,
-        deployment_name=deployment_name,
-        credential=AzureCliCredential()
-    ).create_agent(
+    agent = client.create_agent(
         instructions="You are a helpful assistant",
         tools=get_weather
     )
     
     # Run the agent - it will automatically call the get_weather function
-    print("\n👤 User: What is the weather like in Amsterdam?")
+    lines.append("\n👤 User: What is the weather like in Amsterdam?")
     result = await agent.run("What is the weather like in Amsterdam?")
-    print(f"🤖 Agent: {result.text}\n")
+    lines.append(f"🤖 Agent: {result.text}\n")
+    return lines
 
 
 @ai_function(name="weather_tool", description="Retrieves weather information for any location")
-def get_weather_with_decorator(
+async def get_weather_with_decorator(
     location: Annotated[str, Field(description="The location to get the weather for.")],
 ) -> str:
     """Get the weather for a given location using the ai_function decorator."""
     return f"The weather in {location} is cloudy with a high of 15°C."
 
 
-async def function_tool_with_decorator():
+async def function_tool_with_decorator(client: AzureOpenAIChatClient) -> list[str]:
     """
     Example 2: Function tool with @ai_function decorator
     
     This example shows how to use the @ai_function decorator to explicitly
     specify the function's name and description.
     """
-    print("=" * 70)
-    print("EXAMPLE 2: Function Tool with @ai_function Decorator")
-    print("=" * 70)
-    
-    # Get environment variables
-    endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
-    deployment_name = os.getenv("AZURE_OPENAI_CHAT_DEPLOYMENT_NAME")
-    
-    if not endpoint or not deployment_name:
-        print("Error: Please set AZURE_OPENAI_ENDPOINT and AZURE_OPENAI_CHAT_DEPLOYMENT_NAME in .env file")
-        return
+    lines = []
+    lines.append("=" * 70)
+    lines.append("EXAMPLE 2: Function Tool with @ai_function Decorator")
+    lines.append("=" * 70)
     
     # Create the agent with the decorated function tool
-    agent = AzureOpenAIChatClient(
-        endpoint=endpoint,
-        deployment_name=deployment_name,
-        credential=AzureCliCredential()
-    ).create_agent(
+    agent = client.create_agent(
         instructions="You are a helpful assistant",
         tools=get_weather_with_decorator
     )
     
     # Run the agent
-    print("\n👤 User: What is the weather like in Paris?")
+    lines.append("\n👤 User: What is the weather like in Paris?")
     result = await agent.run("What is the weather like in Paris?")
-    print(f"🤖 Agent: {result.text}\n")
+    lines.append(f"🤖 Agent: {result.text}\n")
+    return lines
+
+
+# State shared by the WeatherTools functions within one conversation. The
+# framework runs each tool call in its own task with a copy of the context,
+# so the conversation sets a mutable dict once and the tools update it in place.
+_weather_state: ContextVar[dict[str, str] | None] = ContextVar("weather_state", default=None)
 
 
 class WeatherTools:
-    """A class containing multiple related function tools."""
+    """
+    A class containing multiple related function tools.
+
+    The last requested location is kept in a context variable rather than on
+    the instance, so one instance can serve concurrent conversations without
+    them overwriting each other's state. Call start_conversation() before a
+    conversation uses the tools.
+    """
     
-    def __init__(self):
-        self.last_location = None
+    def start_conversation(self) -> None:
+        """Give the current conversation its own, empty tool state."""
+        _weather_state.set({})
+    
+    def _state(self) -> dict[str, str]:
+        """Return the tool state of the current conversation."""
+        state = _weather_state.get()
+        if state is None:
+            raise RuntimeError("Call WeatherTools.start_conversation() before using the weather tools.")
+        return state
     
     def get_weather(
         self,
         location: Annotated[str, Field(description="The location to get the weather for.")],
     ) -> str:
         """Get the weather for a given location."""
-        self.last_location = location
+        self._state()["last_location"] = location
         return f"The weather in {location} is cloudy with a high of 15°C."
     
     def get_weather_details(self) -> str:
         """Get the detailed weather for the last requested location."""
-        if self.last_location is None:
+        last_location = self._state().get("last_location")
+        if last_location is None:
             return "No location specified yet."
-        return f"The detailed weather in {self.last_location} is cloudy with a high of 15°C, low of 7°C, and 60% humidity."
+        return f"The detailed weather in {last_location} is cloudy with a high of 15°C, low of 7°C, and 60% humidity."
+
 
+# A single instance shared by every conversation
+weather_tools = WeatherTools()
 
-async def class_with_multiple_tools():
+
+async def class_with_multiple_tools(client: AzureOpenAIChatClient) -> list[str]:
     """
     Example 3: Class with multiple function tools
 
-    This example shows how to organize related functions in a class,
-    which can be useful for sharing state between functions.
+    This example shows how to organize related functions in a class.
+    The functions share per-conversation state, which the class keeps in a
+    context variable rather than on the instance.
     """
-    print("=" * 70)
-    print("EXAMPLE 3: Class with Multiple Function Tools")
-    print("=" * 70)
-
-    # Get environment variables
-    endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
-    deployment_name = os.getenv("AZURE_OPENAI_CHAT_DEPLOYMENT_NAME")
+    lines = []
+    lines.append("=" * 70)
+    lines.append("EXAMPLE 3: Class with Multiple Function Tools")
+    lines.append("=" * 70)
 
-    if not endpoint or not deployment_name:
-        print("Error: Please set AZURE_OPENAI_ENDPOINT and AZURE_OPENAI_CHAT_DEPLOYMENT_NAME in .env file")
-        return
-
-    # Create an instance of the tools class
-    tools = WeatherTools()
+    # Start a fresh tool state for this conversation
+    weather_tools.start_conversation()
 
     # Create the agent with multiple function tools from the class
-    agent = AzureOpenAIChatClient(
-        endpoint=endpoint,
-        deployment_name=deployment_name,
-        credential=AzureCliCredential()
-    ).create_agent(
+    agent = client.create_agent(
         instructions="You are a helpful assistant",
-        tools=[tools.get_weather, tools.get_weather_details]
+        tools=[weather_tools.get_weather, weather_tools.get_weather_details]
     )
 
+    # Keep both requests in one conversation so the follow-up builds on the first turn
+    thread = agent.get_new_thread()
+
     # First request - get basic weather
-    print("\n👤 User: What is the weather like in Tokyo?")
-    result1 = await agent.run("What is the weather like in Tokyo?")
-    print(f"🤖 Agent: {result1.text}\n")
+    lines.append("\n👤 User: What is the weather like in Tokyo?")
+    result1 = await agent.run("What is the weather like in Tokyo?", thread=thread)
+    lines.append(f"🤖 Agent: {result1.text}\n")
 
     # Second request - get detailed weather (uses state from previous call)
-    print("👤 User: Can you give me more details about the weather?")
-    result2 = await agent.run("Can you give me more details about the weather?")
-    print(f"🤖 Agent: {result2.text}\n")
+    lines.append("👤 User: Can you give me more details about the weather?")
+    result2 = await agent.run("Can you give me more details about the weather?", thread=thread)
+    lines.append(f"🤖 Agent: {result2.text}\n")
+    return lines
 
 
 async def main():
     """Run all function tool examples."""
-    await simple_function_tool()
-    print("\n")
-    await function_tool_with_decorator()
-    print("\n")
-    await class_with_multiple_tools()
+    # Build one chat client and share it across all examples
+    client = get_chat_client(CONFIG.endpoint, CONFIG.deployment)
+
+    try:
+        # The examples are independent, so run them concurrently and print
+        # each one's output afterwards to keep it from interleaving.
+        # return_exceptions=True waits for every example to finish, so the
+        # shared client is not closed while another example still uses it
+        results = await asyncio.gather(
+            simple_function_tool(client),
+            function_tool_with_decorator(client),
+            class_with_multiple_tools(client),
+            return_exceptions=True,
+        )
+    finally:
+        await close_chat_clients()
+
+    # Show the output of every example that succeeded, then report the first failure
+    for lines in results:
+        if not isinstance(lines, BaseException):
+            print("\n".join(lines))
+            print("\n")
+
+    for error in results:
+        if isinstance(error, BaseException):
+            raise error
 
 
 if __name__ == "__main__":
@@ -12,6 +12,7 @@ Key Concepts:
 - Check for user_input_requests in the agent response
 - Create approval responses using create_response() method
 - Handle multiple approvals in a loop for complex scenarios
+- Use an approval policy to answer every pending approval of a turn in one step
 
 Prerequisites:
 - Set AZURE_OPENAI_ENDPOINT environment variable (e.g., https://your-resource.openai.azure.com)
@@ -20,55 +21,100 @@ Prerequisites:
 """
 
 import asyncio
-import os
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
 from typing import Annotated
-from agent_framework import ai_function, ChatMessage, Role
+from agent_framework import ai_function, ChatMessage, FunctionApprovalRequestContent, Role
 from agent_framework.azure import AzureOpenAIChatClient
-from azure.identity import AzureCliCredential
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
+from clients import close_chat_clients, get_chat_client
+from config import CONFIG
 
 
 # Function that does NOT require approval
 @ai_function
-def get_weather(location: Annotated[str, "The city and state, e.g. San Francisco, CA"]) -> str:
+async def get_weather(location: Annotated[str, "The city and state, e.g. San Francisco, CA"]) -> str:
     """Get the current weather for a given location."""
     return f"The weather in {location} is cloudy with a high of 15°C."
 
 
 # Function that REQUIRES approval before execution
 @ai_function(approval_mode="always_require")
-def get_weather_detail(location: Annotated[str, "The city and state, e.g. San Francisco, CA"]) -> str:
+async def get_weather_detail(location: Annotated[str, "The city and state, e.g. San Francisco, CA"]) -> str:
     """Get detailed weather information for a given location."""
     return f"The weather in {location} is cloudy with a high of 15°C, humidity 88%, wind 10 km/h."
 
 
-async def simple_approval_example():
+class ApprovalPolicy(ABC):
+    """Decides which of the pending function calls in an agent turn are approved."""
+
+    @abstractmethod
+    async def approve_many(self, requests: Sequence[FunctionApprovalRequestContent]) -> list[bool]:
+        """Return one approval decision per request, in the same order."""
+
+
+class TerminalPolicy(ApprovalPolicy):
+    """Asks the user once in the terminal for all pending function calls."""
+
+    async def approve_many(self, requests: Sequence[FunctionApprovalRequestContent]) -> list[bool]:
+        for number, request in enumerate(requests, start=1):
+            print(f"\n⚠️  Approval needed ({number}): {request.function_call.name}")
+            print(f"   Arguments: {request.function_call.arguments}")
+
+        if len(requests) == 1:
+            prompt = "\n   Approve this function call? (yes/no): "
+        else:
+            prompt = "\n   Approve these function calls? (yes/no, or the numbers to approve, e.g. 1,3): "
+
+        # Read the answer without blocking the event loop
+        answer = (await asyncio.to_thread(input, prompt)).strip().lower()
+
+        if answer == "yes":
+            return [True] * len(requests)
+
+        approved_numbers = {part.strip() for part in answer.split(",")}
+        return [str(number) in approved_numbers for number in range(1, len(requests) + 1)]
+
+
+class AllowListPolicy(ApprovalPolicy):
+    """
+    Approves calls to trusted functions automatically.
+
+    Calls to any other function are passed to the fallback policy, or
+    rejected when there is none.
+    """
+
+    def __init__(self, names, fallback: ApprovalPolicy | None = None):
+        self.names = set(names)
+        self.fallback = fallback
+
+    async def approve_many(self, requests: Sequence[FunctionApprovalRequestContent]) -> list[bool]:
+        approvals = [request.function_call.name in self.names for request in requests]
+        pending = [request for request, approved in zip(requests, approvals) if not approved]
+
+        for request, approved in zip(requests, approvals):
+            if approved:
+                print(f"\n✓ Auto-approved: {request.function_call.name}({request.function_call.arguments})")
+
+        if pending and self.fallback is not None:
+            decisions = iter(await self.fallback.approve_many(pending))
+            approvals = [approved or next(decisions) for approved in approvals]
+
+        return approvals
+
+
+async def simple_approval_example(client: AzureOpenAIChatClient):
     """
     Example 1: Simple function approval
     
-    This example shows how to handle a single function call that requires approval.
+    This example shows how to handle a single function call that requires approval,
+    using the same approval loop as the next example.
     """
     print("=" * 70)
     print("EXAMPLE 1: Simple Function Approval")
     print("=" * 70)
     
-    # Get environment variables
-    endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
-    deployment_name = os.getenv("AZURE_OPENAI_CHAT_DEPLOYMENT_NAME")
-    
-    if not endpoint or not deployment_name:
-        print("Error: Please set AZURE_OPENAI_ENDPOINT and AZURE_OPENAI_CHAT_DEPLOYMENT_NAME in .env file")
-        return
-    
     # Create the agent with both functions
-    agent = AzureOpenAIChatClient(
-        endpoint=endpoint,
-        deployment_name=deployment_name,
-        credential=AzureCliCredential()
-    ).create_agent(
+    agent = client.create_agent(
         instructions="You are a helpful weather assistant.",
         name="WeatherAgent",
         tools=[get_weather, get_weather_detail]
@@ -76,101 +122,60 @@ async def simple_approval_example():
     
     # Ask for detailed weather (which requires approval)
     print("\n👤 User: What is the detailed weather like in Amsterdam?")
-    result = await agent.run("What is the detailed weather like in Amsterdam?")
-    
-    # Check if there are any approval requests
-    if result.user_input_requests:
-        print("\n⚠️  Approval Required!")
-        
-        for user_input_needed in result.user_input_requests:
-            print(f"   Function: {user_input_needed.function_call.name}")
-            print(f"   Arguments: {user_input_needed.function_call.arguments}")
-            
-            # Simulate user approval (in a real app, this would be interactive)
-            user_approval = input("\n   Approve this function call? (yes/no): ").lower() == "yes"
-            
-            # Create the approval response
-            approval_message = ChatMessage(
-                role=Role.USER,
-                contents=[user_input_needed.create_response(user_approval)]
-            )
-            
-            # Continue the conversation with the approval
-            final_result = await agent.run([
-                "What is the detailed weather like in Amsterdam?",
-                ChatMessage(role=Role.ASSISTANT, contents=[user_input_needed]),
-                approval_message
-            ])
-            
-            print(f"\n🤖 Agent: {final_result.text}\n")
-    else:
-        print(f"\n🤖 Agent: {result.text}\n")
-
-
-async def handle_approvals(query: str, agent) -> str:
+    result_text = await handle_approvals("What is the detailed weather like in Amsterdam?", agent)
+    print(f"\n🤖 Agent: {result_text}\n")
+
+
+async def handle_approvals(query: str, agent, policy: ApprovalPolicy | None = None) -> str:
     """
     Helper function to handle function call approvals in a loop.
     
     This handles multiple function calls that may require approval,
     continuing until all approvals are processed and a final result is obtained.
+    The conversation lives on a thread, so each round only sends the new
+    approval responses instead of rebuilding the whole history.
+    All approvals of a turn are decided together by the policy, which asks
+    the user in the terminal unless another policy is given.
     """
+    policy = policy or TerminalPolicy()
+    thread = agent.get_new_thread()
     current_input = query
     
     while True:
-        result = await agent.run(current_input)
+        result = await agent.run(current_input, thread=thread)
         print("Result: ", result.user_input_requests)
         
         if not result.user_input_requests:
             # No more approvals needed, return the final result
             return result.text
         
-        # Build new input with all context
-        new_inputs = [query]
+        # Decide all approvals for this round in one step
+        approvals = await policy.approve_many(result.user_input_requests)
+        new_inputs = [
+            ChatMessage(role=Role.USER, contents=[user_input_needed.create_response(user_approval)])
+            for user_input_needed, user_approval in zip(result.user_input_requests, approvals)
+        ]
         
-        for user_input_needed in result.user_input_requests:
-            print(f"\n⚠️  Approval needed for: {user_input_needed.function_call.name}")
-            print(f"   Arguments: {user_input_needed.function_call.arguments}")
-            
-            # Add the assistant message with the approval request
-            new_inputs.append(ChatMessage(role=Role.ASSISTANT, contents=[user_input_needed]))
-            
-            # Get user approval (in practice, this would be interactive)
-            user_approval = input("   Approve this function call? (yes/no): ").lower() == "yes"
-            
-            # Add the user's approval response
-            new_inputs.append(
-                ChatMessage(role=Role.USER, contents=[user_input_needed.create_response(user_approval)])
-            )
-        
-        # Continue with all the context
+        # The thread already holds the query and the approval requests
         current_input = new_inputs
 
 
-async def multiple_approvals_example():
+async def multiple_approvals_example(client: AzureOpenAIChatClient):
     """
     Example 2: Multiple function approvals in a loop
 
     This example shows how to handle multiple function calls that require approval
     using a helper function that loops until all approvals are processed.
+    When any call of a turn needs approval, every call of that turn is sent for
+    approval, so an allow-list policy approves the harmless get_weather calls and
+    only asks the user about the rest.
     """
     print("=" * 70)
     print("EXAMPLE 2: Multiple Function Approvals")
     print("=" * 70)
 
-    # Get environment variables
-    endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
-    deployment_name = os.getenv("AZURE_OPENAI_CHAT_DEPLOYMENT_NAME")
-
-    if not endpoint or not deployment_name:
-        print("Error: Please set AZURE_OPENAI_ENDPOINT and AZURE_OPENAI_CHAT_DEPLOYMENT_NAME in .env file")
-        return
-
     # Create the agent with both functions
-    agent = AzureOpenAIChatClient(
-        endpoint=endpoint,
-        deployment_name=deployment_name,
-        credential=AzureCliCredential()
-    ).create_agent(
+    agent = client.create_agent(
         instructions="You are a helpful weather assistant.",
         name="WeatherAgent",
         tools=[get_weather, get_weather_detail]
@@ -178,7 +183,8 @@ async def multiple_approvals_example():
 
     # Ask for detailed weather for multiple cities
     print("\n👤 User: Get detailed weather for Seattle and Portland")
-    result_text = await handle_approvals("Get detailed weather for Seattle and Portland", agent)
+    policy = AllowListPolicy(["get_weather"], fallback=TerminalPolicy())
+    result_text = await handle_approvals("Get detailed weather for Seattle and Portland", agent, policy)
     print(f"\n🤖 Agent: {result_text}\n")
 
 
@@ -187,9 +193,15 @@ async def main():
     print("\nThis tutorial demonstrates human-in-the-loop approvals for function calls.")
     print("You'll be prompted to approve or reject function calls.\n")
 
-    await simple_approval_example()
-    print("\n")
-    await multiple_approvals_example()
+    # Build one chat client and share it across all examples
+    client = get_chat_client(CONFIG.endpoint, CONFIG.deployment)
+
+    try:
+        await simple_approval_example(client)
+        print("\n")
+        await multiple_approvals_example(client)
+    finally:
+        await close_chat_clients()
 
 
 if __name__ == "__main__":
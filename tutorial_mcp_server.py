@@ -20,20 +20,25 @@ Prerequisites:
 """
 
 import asyncio
-import os
+import logging
 from typing import Annotated
 from pydantic import Field
-from agent_framework.azure import AzureOpenAIChatClient
-from azure.identity import AzureCliCredential
-from dotenv import load_dotenv
+from agent_framework import ai_function
 import anyio
 from mcp.server.stdio import stdio_server
+from clients import close_chat_clients, get_chat_client
+from config import CONFIG
+from server_logging import setup_queue_logging
 
-# Load environment variables from .env file
-load_dotenv()
+# Status messages go to stderr; stdout carries the MCP protocol
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
 
 
-def get_specials() -> Annotated[str, "Returns the specials from the menu."]:
+# Decorating the tools at import time builds their schemas once, instead of
+# the framework wrapping the plain functions again for every request
+@ai_function(name="get_specials", description="Get the daily specials from the restaurant menu.")
+async def get_specials() -> Annotated[str, "Returns the specials from the menu."]:
     """Get the daily specials from the restaurant menu."""
     return """
         Special Soup: Clam Chowder
@@ -42,11 +47,12 @@ def get_specials() -> Annotated[str, "Returns the specials from the menu."]:
         """
 
 
-def get_item_price(
+@ai_function(name="get_item_price", description="Get the price of a menu item.")
+async def get_item_price(
     menu_item: Annotated[str, "The name of the menu item."],
 ) -> Annotated[str, "Returns the price of the menu item."]:
     """Get the price of a menu item."""
-    # In a real application, this would look up the price in a database
+    # In a real application, this would await the price lookup in a database
     return "$9.99"
 
 
@@ -59,55 +65,44 @@ async def run():
     2. Exposes the agent as an MCP server
     3. Runs the server over stdio (standard input/output)
     """
-    # Get environment variables
-    endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
-    deployment_name = os.getenv("AZURE_OPENAI_CHAT_DEPLOYMENT_NAME")
-    
-    if not endpoint or not deployment_name:
-        print("Error: Please set AZURE_OPENAI_ENDPOINT and AZURE_OPENAI_CHAT_DEPLOYMENT_NAME in .env file")
-        print("\nExample .env file:")
-        print("AZURE_OPENAI_ENDPOINT=https://your-resource.openai.azure.com")
-        print("AZURE_OPENAI_CHAT_DEPLOYMENT_NAME=gpt-4o-mini")
-        return
-    
-    print("=" * 70)
-    print("MCP Server: Restaurant Agent")
-    print("=" * 70)
-    print(f"Using endpoint: {endpoint}")
-    print(f"Using deployment: {deployment_name}")
-    print("\nCreating agent with restaurant menu tools...")
+    logger.info("=" * 70)
+    logger.info("MCP Server: Restaurant Agent")
+    logger.info("=" * 70)
+    logger.info("Using endpoint: %s", CONFIG.endpoint)
+    logger.info("Using deployment: %s", CONFIG.deployment)
+    logger.info("Creating agent with restaurant menu tools...")
     
     # Create an agent with tools
-    agent = AzureOpenAIChatClient(
-        endpoint=endpoint,
-        deployment_name=deployment_name,
-        credential=AzureCliCredential()
-    ).create_agent(
+    agent = get_chat_client(CONFIG.endpoint, CONFIG.deployment).create_agent(
         name="RestaurantAgent",
         description="Answer questions about the menu.",
         tools=[get_specials, get_item_price],
     )
     
-    print("Agent created successfully!")
-    print("\nExposing agent as MCP server...")
+    logger.info("Agent created successfully!")
+    logger.info("Exposing agent as MCP server...")
     
     # Expose the agent as an MCP server
     server = agent.as_mcp_server()
     
-    print("MCP server created!")
-    print("\nStarting MCP server over stdio...")
-    print("The server is now ready to accept requests from MCP clients.")
-    print("(Press Ctrl+C to stop the server)")
-    print("=" * 70)
+    logger.info("MCP server created!")
+    logger.info("Starting MCP server over stdio...")
+    logger.info("The server is now ready to accept requests from MCP clients.")
+    logger.info("(Press Ctrl+C to stop the server)")
+    logger.info("=" * 70)
     
     # Setup the MCP server to listen for incoming requests over stdio
     async def handle_stdin():
         async with stdio_server() as (read_stream, write_stream):
             await server.run(read_stream, write_stream, server.create_initialization_options())
     
-    await handle_stdin()
+    try:
+        await handle_stdin()
+    finally:
+        await close_chat_clients()
 
 
 if __name__ == "__main__":
+    setup_queue_logging()
     anyio.run(run)
 
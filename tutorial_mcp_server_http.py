@@ -2,38 +2,46 @@
 Tutorial: Exposing an Agent as an MCP Tool over HTTP
 
 This tutorial demonstrates how to expose an agent as a tool over HTTP using
-the Model Context Protocol (MCP) with Server-Sent Events (SSE).
+the Model Context Protocol (MCP) with the streamable HTTP transport.
 
 Key Concepts:
 - MCP server exposed over HTTP instead of stdio
-- Uses SSE (Server-Sent Events) for streaming responses
+- Uses the streamable HTTP transport: one endpoint carries both requests and streamed responses
 - Accessible via HTTP port (default: 8000)
+- Runs a single server worker by default; set MCP_SERVER_WORKERS to start a pool of
+  worker processes. Each worker fetches its own access token (locally, one 'az'
+  call each) and sends one small warmup completion at startup
 - Can be tested with HTTP clients or MCP clients that support HTTP transport
 
 Prerequisites:
 - Set AZURE_OPENAI_ENDPOINT environment variable
 - Set AZURE_OPENAI_CHAT_DEPLOYMENT_NAME environment variable
 - Run 'az login' to authenticate with Azure CLI
-- Install dependencies: uv add mcp anyio uvicorn
+- Install dependencies: uv add mcp anyio uvicorn httptools uvloop
 """
 
+import logging
 import os
+from contextlib import asynccontextmanager
 from typing import Annotated
 from pydantic import Field
-from agent_framework.azure import AzureOpenAIChatClient
-from azure.identity import AzureCliCredential
-from dotenv import load_dotenv
+from agent_framework import ai_function
 import uvicorn
-from mcp.server.sse import SseServerTransport
+from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
 from starlette.applications import Starlette
-from starlette.routing import Route, Mount
-from starlette.responses import Response
+from starlette.routing import Route
+from clients import close_chat_clients, get_chat_client
+from config import CONFIG
+from server_logging import setup_queue_logging
 
-# Load environment variables from .env file
-load_dotenv()
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
 
 
-def get_specials() -> Annotated[str, "Returns the specials from the menu."]:
+# Decorating the tools at import time builds their schemas once, instead of
+# the framework wrapping the plain functions again for every request
+@ai_function(name="get_specials", description="Get the daily specials from the restaurant menu.")
+async def get_specials() -> Annotated[str, "Returns the specials from the menu."]:
     """Get the daily specials from the restaurant menu."""
     return """
         Special Soup: Clam Chowder
@@ -42,7 +50,8 @@ def get_specials() -> Annotated[str, "Returns the specials from the menu."]:
         """
 
 
-def get_item_price(
+@ai_function(name="get_item_price", description="Get the price of a menu item.")
+async def get_item_price(
     menu_item: Annotated[str, "The name of the menu item."],
 ) -> Annotated[str, "Returns the price of the menu item."]:
     """Get the price of a menu item."""
@@ -51,72 +60,95 @@ def get_item_price(
 
 # Global instances
 mcp_server = None
-sse_transport = None
+session_manager = None
 
 
-async def handle_sse(request):
-    """Handle SSE connections for MCP."""
-    async with sse_transport.connect_sse(
-        request.scope, request.receive, request._send
-    ) as (read_stream, write_stream):
-        await mcp_server.run(
-            read_stream,
-            write_stream,
-            mcp_server.create_initialization_options()
-        )
-    # Return empty response to avoid NoneType error
-    return Response()
+class MCPEndpoint:
+    """ASGI endpoint that hands MCP requests to the streamable HTTP session manager."""
+
+    async def __call__(self, scope, receive, send):
+        await session_manager.handle_request(scope, receive, send)
+
+
+async def _warmup():
+    """
+    Send one throwaway completion before the server accepts requests.
+
+    The access token is already fetched when the chat client is created, so
+    this primes the pooled connection and TLS session that the first MCP
+    request would otherwise have to open. The request goes straight to the
+    chat client, without the agent's tools, so it cannot start a tool call.
+    """
+    try:
+        await get_chat_client(CONFIG.endpoint, CONFIG.deployment).get_response("ping", max_tokens=1)
+        logger.info("✓ Chat client connection warmed up")
+    except Exception as e:
+        # The server still works without a warm connection
+        logger.warning("Warmup request failed: %s", e, exc_info=True)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """
+    Warm up the chat client connection, run the MCP session manager while
+    the server is up, and release the shared chat client connections when
+    it shuts down.
+    """
+    try:
+        # Warm up on the server's own event loop, where the pooled connection is used
+        await _warmup()
+
+        async with session_manager.run():
+            yield
+    finally:
+        await close_chat_clients()
 
 
 def create_app():
-    """Create the Starlette application with MCP server."""
-    global mcp_server, sse_transport
-
-    # Get environment variables
-    endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
-    deployment_name = os.getenv("AZURE_OPENAI_CHAT_DEPLOYMENT_NAME")
-
-    if not endpoint or not deployment_name:
-        raise ValueError(
-            "Please set AZURE_OPENAI_ENDPOINT and AZURE_OPENAI_CHAT_DEPLOYMENT_NAME "
-            "environment variables"
-        )
-
-    print("=" * 70)
-    print("MCP Server: Restaurant Agent (HTTP/SSE)")
-    print("=" * 70)
-    print(f"Using endpoint: {endpoint}")
-    print(f"Using deployment: {deployment_name}")
-    print("\nCreating agent with restaurant menu tools...")
+    """
+    Create the Starlette application with MCP server.
+
+    uvicorn calls this factory once in every worker process, so each worker
+    builds its own agent, chat client and session manager.
+    """
+    global mcp_server, session_manager
+
+    # Workers are started as fresh processes and need their own log listener
+    setup_queue_logging()
+
+    logger.info("=" * 70)
+    logger.info("MCP Server: Restaurant Agent (streamable HTTP)")
+    logger.info("=" * 70)
+    logger.info("Using endpoint: %s", CONFIG.endpoint)
+    logger.info("Using deployment: %s", CONFIG.deployment)
+    logger.info("Creating agent with restaurant menu tools...")
 
     # Create an agent with tools
-    agent = AzureOpenAIChatClient(
-        endpoint=endpoint,
-        deployment_name=deployment_name,
-        credential=AzureCliCredential()
-    ).create_agent(
+    agent = get_chat_client(CONFIG.endpoint, CONFIG.deployment).create_agent(
         name="RestaurantAgent",
         description="Answer questions about the menu.",
         tools=[get_specials, get_item_price],
     )
 
-    print("✓ Agent created successfully!")
-    print("\nExposing agent as MCP server...")
+    logger.info("✓ Agent created successfully!")
+    logger.info("Exposing agent as MCP server...")
 
     # Expose the agent as an MCP server
     mcp_server = agent.as_mcp_server()
 
-    print("✓ MCP server created!")
+    logger.info("✓ MCP server created!")
 
-    # Create SSE transport
-    sse_transport = SseServerTransport("/messages/")
+    # Create the streamable HTTP session manager. It is stateless because the
+    # requests of one MCP session may reach different worker processes, and
+    # a worker does not know the sessions started in another one
+    session_manager = StreamableHTTPSessionManager(app=mcp_server, stateless=True)
 
-    # Create Starlette app with SSE endpoint
+    # Create Starlette app with a single MCP endpoint
     app = Starlette(
         routes=[
-            Route("/sse", endpoint=handle_sse, methods=["GET"]),
-            Mount("/messages/", app=sse_transport.handle_post_message),
-        ]
+            Route("/mcp", endpoint=MCPEndpoint()),
+        ],
+        lifespan=lifespan,
     )
 
     return app
@@ -124,28 +156,36 @@ def create_app():
 
 def main():
     """Run the HTTP MCP server."""
+    setup_queue_logging()
+
     port = int(os.getenv("MCP_SERVER_PORT", "8000"))
     host = os.getenv("MCP_SERVER_HOST", "127.0.0.1")
+    workers = int(os.getenv("MCP_SERVER_WORKERS", "1"))
     
-    print("\n" + "=" * 70)
-    print(f"Starting MCP server on http://{host}:{port}")
-    print("=" * 70)
-    print(f"\nEndpoints:")
-    print(f"  - SSE: http://{host}:{port}/sse")
-    print(f"  - Messages: http://{host}:{port}/messages")
-    print("\nPress Ctrl+C to stop the server")
-    print("=" * 70 + "\n")
-    
-    app = create_app()
+    logger.info("=" * 70)
+    logger.info("Starting MCP server on http://%s:%s with %s worker(s)", host, port, workers)
+    logger.info("=" * 70)
+    logger.info("Endpoints:")
+    logger.info("  - MCP: http://%s:%s/mcp", host, port)
+    logger.info("Press Ctrl+C to stop the server")
+    logger.info("=" * 70)
     
+    # uvicorn needs the app as an import string to start worker processes;
+    # the workers accept connections from one shared listening socket.
+    # uvloop and httptools replace the pure-Python event loop and HTTP parser;
+    # loop="auto" falls back to asyncio where uvloop is unavailable (Windows)
     uvicorn.run(
-        app,
+        "tutorial_mcp_server_http:create_app",
+        factory=True,
         host=host,
         port=port,
-        log_level="info"
+        workers=workers,
+        loop="auto",
+        http="httptools",
+        log_level="warning",
+        access_log=False
     )
 
 
 if __name__ == "__main__":
     main()
-
@@ -11,24 +11,24 @@ Key Concepts:
 - Use AgentThread objects to hold conversation state
 - Pass the thread to run() to maintain context between calls
 - Multiple threads allow independent conversations with the same agent
+- Independent threads can be run concurrently with asyncio.gather
+- With the Responses API and store=True, threads are kept on the service, so each
+  turn only sends the new message instead of the whole conversation history
 
 Prerequisites:
 - Set AZURE_OPENAI_ENDPOINT environment variable (e.g., https://your-resource.openai.azure.com)
-- Set AZURE_OPENAI_CHAT_DEPLOYMENT_NAME environment variable
+- Set AZURE_OPENAI_CHAT_DEPLOYMENT_NAME environment variable (a model deployment that
+  supports the Responses API)
 - Run 'az login' to authenticate with Azure CLI
 """
 
 import asyncio
-import os
-from agent_framework.azure import AzureOpenAIChatClient
-from azure.identity import AzureCliCredential
-from dotenv import load_dotenv
+from agent_framework import ChatAgent
+from clients import close_chat_clients, get_responses_client
+from config import CONFIG
 
-# Load environment variables from .env file
-load_dotenv()
 
-
-async def basic_multiturn_conversation():
+async def basic_multiturn_conversation(agent: ChatAgent):
     """
     Basic multi-turn conversation example.
     
@@ -39,24 +39,6 @@ async def basic_multiturn_conversation():
     print("EXAMPLE 1: Basic Multi-turn Conversation")
     print("=" * 70)
     
-    # Get environment variables
-    endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
-    deployment_name = os.getenv("AZURE_OPENAI_CHAT_DEPLOYMENT_NAME")
-    
-    if not endpoint or not deployment_name:
-        print("Error: Please set AZURE_OPENAI_ENDPOINT and AZURE_OPENAI_CHAT_DEPLOYMENT_NAME in .env file")
-        return
-    
-    # Create the agent
-    agent = AzureOpenAIChatClient(
-        endpoint=endpoint,
-        deployment_name=deployment_name,
-        credential=AzureCliCredential()
-    ).create_agent(
-        instructions="You are good at telling jokes.",
-        name="Joker"
-    )
-    
     # Create a thread to hold the conversation state
     thread = agent.get_new_thread()
     
@@ -74,7 +56,7 @@ async def basic_multiturn_conversation():
     print(f"🤖 Agent: {result2.text}\n")
 
 
-async def multiple_conversations():
+async def multiple_conversations(agent: ChatAgent):
     """
     Multiple independent conversations with the same agent.
     
@@ -85,64 +67,66 @@ async def multiple_conversations():
     print("EXAMPLE 2: Multiple Independent Conversations")
     print("=" * 70)
     
-    # Get environment variables
-    endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
-    deployment_name = os.getenv("AZURE_OPENAI_CHAT_DEPLOYMENT_NAME")
-    
-    if not endpoint or not deployment_name:
-        print("Error: Please set AZURE_OPENAI_ENDPOINT and AZURE_OPENAI_CHAT_DEPLOYMENT_NAME in .env file")
-        return
-    
-    # Create the agent
-    agent = AzureOpenAIChatClient(
-        endpoint=endpoint,
-        deployment_name=deployment_name,
-        credential=AzureCliCredential()
-    ).create_agent(
-        instructions="You are good at telling jokes.",
-        name="Joker"
-    )
-    
     # Create two separate threads for independent conversations
     thread1 = agent.get_new_thread()
     thread2 = agent.get_new_thread()
     
+    async def converse(thread, first, second):
+        """Run two turns on one thread; the second turn builds on the first."""
+        result1 = await agent.run(first, thread=thread)
+        result2 = await agent.run(second, thread=thread)
+        return result1, result2
+    
+    pirate_joke = "Tell me a joke about a pirate."
+    pirate_follow_up = "Now add some emojis to the joke and tell it in the voice of a pirate's parrot."
+    robot_joke = "Tell me a joke about a robot."
+    robot_follow_up = "Now add some emojis to the joke and tell it in the voice of a robot."
+    
+    # The threads share no state, so both conversations run at the same time
+    (pirate1, pirate2), (robot1, robot2) = await asyncio.gather(
+        converse(thread1, pirate_joke, pirate_follow_up),
+        converse(thread2, robot_joke, robot_follow_up)
+    )
+    
     # Conversation 1 - about pirates
     print("\n[CONVERSATION 1]")
-    print("👤 User: Tell me a joke about a pirate.")
-    result1 = await agent.run("Tell me a joke about a pirate.", thread=thread1)
-    print(f"🤖 Agent: {result1.text}\n")
+    print(f"👤 User: {pirate_joke}")
+    print(f"🤖 Agent: {pirate1.text}\n")
     
     # Conversation 2 - about robots
     print("[CONVERSATION 2]")
-    print("👤 User: Tell me a joke about a robot.")
-    result2 = await agent.run("Tell me a joke about a robot.", thread=thread2)
-    print(f"🤖 Agent: {result2.text}\n")
+    print(f"👤 User: {robot_joke}")
+    print(f"🤖 Agent: {robot1.text}\n")
     
     # Continue conversation 1 - agent remembers the pirate joke
     print("[CONVERSATION 1 - continued]")
-    print("👤 User: Now add some emojis to the joke and tell it in the voice of a pirate's parrot.")
-    result3 = await agent.run(
-        "Now add some emojis to the joke and tell it in the voice of a pirate's parrot.",
-        thread=thread1
-    )
-    print(f"🤖 Agent: {result3.text}\n")
+    print(f"👤 User: {pirate_follow_up}")
+    print(f"🤖 Agent: {pirate2.text}\n")
     
     # Continue conversation 2 - agent remembers the robot joke
     print("[CONVERSATION 2 - continued]")
-    print("👤 User: Now add some emojis to the joke and tell it in the voice of a robot.")
-    result4 = await agent.run(
-        "Now add some emojis to the joke and tell it in the voice of a robot.",
-        thread=thread2
-    )
-    print(f"🤖 Agent: {result4.text}\n")
+    print(f"👤 User: {robot_follow_up}")
+    print(f"🤖 Agent: {robot2.text}\n")
 
 
 async def main():
     """Run all multi-turn conversation examples."""
-    await basic_multiturn_conversation()
-    print("\n")
-    await multiple_conversations()
+    # Build one agent and share it across both examples; the conversations
+    # stay separate because each one has its own thread.
+    # store=True keeps each thread's responses on the service, so follow-up
+    # turns reference the previous response instead of re-sending the history
+    agent = get_responses_client(CONFIG.endpoint, CONFIG.deployment).create_agent(
+        instructions="You are good at telling jokes.",
+        name="Joker",
+        store=True
+    )
+
+    try:
+        await basic_multiturn_conversation(agent)
+        print("\n")
+        await multiple_conversations(agent)
+    finally:
+        await close_chat_clients()
 
 
 if __name__ == "__main__":
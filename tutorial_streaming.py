@@ -13,13 +13,14 @@ Prerequisites:
 """
 
 import asyncio
-import os
-from agent_framework.azure import AzureOpenAIChatClient
-from azure.identity import AzureCliCredential
-from dotenv import load_dotenv
+import sys
+import time
+from clients import build_agent, close_chat_clients
 
-# Load environment variables from .env file
-load_dotenv()
+# Streamed text is written once this many characters are buffered...
+FLUSH_CHARS = 64
+# ...or once this many seconds have passed since the last write
+FLUSH_INTERVAL = 0.05
 
 
 async def main():
@@ -29,29 +30,34 @@ async def main():
     The agent will stream a list of update objects, and accessing the .text property
     on each update object provides the part of the text result contained in that update.
     """
-    # Get environment variables
-    endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
-    deployment_name = os.getenv("AZURE_OPENAI_CHAT_DEPLOYMENT_NAME")
+    # Create the agent
+    agent = build_agent("You are good at telling stories.", "Storyteller")
 
-    if not endpoint or not deployment_name:
-        print("Error: Please set AZURE_OPENAI_ENDPOINT and AZURE_OPENAI_CHAT_DEPLOYMENT_NAME in .env file")
-        return
+    try:
+        # Collect the small streamed updates and write them in batches, so the
+        # terminal gets a few larger writes instead of one flushed write per update
+        buffer = []
+        buffered_chars = 0
+        last_flush = time.monotonic()
 
-    # Create the agent
-    agent = AzureOpenAIChatClient(
-        endpoint=endpoint,
-        deployment_name=deployment_name,
-        credential=AzureCliCredential()
-    ).create_agent(
-        instructions="You are good at telling stories.",
-        name="Storyteller"
-    )
-
-    # Run the agent with streaming
-    async for update in agent.run_stream("Tell me a story about pirates."):
-        if update.text:
-            print(update.text, end="", flush=True)
-    print()  # New line after streaming is complete
+        # Run the agent with streaming
+        async for update in agent.run_stream("Tell me a story about pirates."):
+            if update.text:
+                buffer.append(update.text)
+                buffered_chars += len(update.text)
+
+            if buffer and (buffered_chars >= FLUSH_CHARS or time.monotonic() - last_flush >= FLUSH_INTERVAL):
+                sys.stdout.write("".join(buffer))
+                sys.stdout.flush()
+                buffer.clear()
+                buffered_chars = 0
+                last_flush = time.monotonic()
+
+        # Write the rest, plus a new line after streaming is complete
+        sys.stdout.write("".join(buffer) + "\n")
+        sys.stdout.flush()
+    finally:
+        await close_chat_clients()
 
 
 if __name__ == "__main__":
@@ -13,14 +13,17 @@ Prerequisites:
 """
 
 import asyncio
-import os
 from agent_framework import ChatMessage, TextContent, Role
-from agent_framework.azure import AzureOpenAIChatClient
-from azure.identity import AzureCliCredential
-from dotenv import load_dotenv
+from clients import build_agent, close_chat_clients
 
-# Load environment variables from .env file
-load_dotenv()
+# System message that overrides the agent's default joke-telling behavior.
+# It never changes, so it is built once; the prompt has no surrounding
+# whitespace so every request starts with exactly the same prefix
+REFUSAL_PROMPT = (
+    "If the user asks you to tell a joke, refuse to do so, explaining that you are not a clown.\n"
+    "Offer the user an interesting fact instead."
+)
+SYSTEM_MESSAGE = ChatMessage(role=Role.SYSTEM, contents=[TextContent(text=REFUSAL_PROMPT)])
 
 
 async def main():
@@ -30,42 +33,21 @@ async def main():
     You can provide multiple ChatMessage objects, including system messages
     to override or extend the agent's instructions.
     """
-    # Get environment variables
-    endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
-    deployment_name = os.getenv("AZURE_OPENAI_CHAT_DEPLOYMENT_NAME")
-
-    if not endpoint or not deployment_name:
-        print("Error: Please set AZURE_OPENAI_ENDPOINT and AZURE_OPENAI_CHAT_DEPLOYMENT_NAME in .env file")
-        return
-
     # Create the agent
-    agent = AzureOpenAIChatClient(
-        endpoint=endpoint,
-        deployment_name=deployment_name,
-        credential=AzureCliCredential()
-    ).create_agent(
-        instructions="You are good at telling jokes.",
-        name="Joker"
-    )
-
-    # Create system message to override the default behavior
-    system_message = ChatMessage(
-        role=Role.SYSTEM,
-        contents=[TextContent(text="""
-        If the user asks you to tell a joke, refuse to do so, explaining that you are not a clown.
-        Offer the user an interesting fact instead.
-        """)]
-    )
-
-    # Create user message
-    user_message = ChatMessage(
-        role=Role.USER,
-        contents=[TextContent(text="Tell me a joke about a pirate.")]
-    )
-
-    # Run the agent with both messages
-    result = await agent.run([system_message, user_message])
-    print(result.text)
+    agent = build_agent("You are good at telling jokes.", "Joker")
+
+    try:
+        # Create user message
+        user_message = ChatMessage(
+            role=Role.USER,
+            contents=[TextContent(text="Tell me a joke about a pirate.")]
+        )
+
+        # Run the agent with both messages
+        result = await agent.run([SYSTEM_MESSAGE, user_message])
+        print(result.text)
+    finally:
+        await close_chat_clients()
 
 
 if __name__ == "__main__":
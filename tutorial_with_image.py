@@ -4,6 +4,10 @@ Tutorial: Agent Run with ChatMessage and Image
 This tutorial demonstrates how to use ChatMessage objects with the agent,
 including sending images for analysis.
 
+The image is downloaded once at a reduced size and cached in .cache/, then sent
+inline with the message, so the model does not fetch and process the
+full-resolution original on every run.
+
 From: https://learn.microsoft.com/en-us/agent-framework/tutorials/agents/run-agent
 
 Prerequisites:
@@ -13,14 +17,34 @@ Prerequisites:
 """
 
 import asyncio
-import os
-from agent_framework import ChatMessage, TextContent, UriContent, Role
-from agent_framework.azure import AzureOpenAIChatClient
-from azure.identity import AzureCliCredential
-from dotenv import load_dotenv
+import urllib.request
+from pathlib import Path
+from agent_framework import ChatMessage, DataContent, TextContent, Role
+from clients import build_agent, close_chat_clients
+
+# Wikimedia serves a 500px-wide rendition of the original image, which is
+# plenty for the model and far fewer image tokens than the full resolution
+IMAGE_URL = "https://upload.wikimedia.org/wikipedia/commons/thumb/1/11/Joseph_Grimaldi.jpg/500px-Joseph_Grimaldi.jpg"
+IMAGE_CACHE = Path(__file__).parent / ".cache" / "Joseph_Grimaldi_500px.jpg"
+
+
+def load_image() -> bytes:
+    """Return the image bytes, downloading them only on the first run."""
+    if IMAGE_CACHE.exists():
+        return IMAGE_CACHE.read_bytes()
 
-# Load environment variables from .env file
-load_dotenv()
+    # Wikimedia asks clients to identify themselves with a User-Agent
+    request = urllib.request.Request(IMAGE_URL, headers={"User-Agent": "agent-framework-quickstart/0.1"})
+    with urllib.request.urlopen(request, timeout=10) as response:
+        image = response.read()
+
+    # Write to a temporary file and move it into place, so an interrupted
+    # write never leaves a truncated image in the cache
+    IMAGE_CACHE.parent.mkdir(exist_ok=True)
+    partial = IMAGE_CACHE.with_suffix(".tmp")
+    partial.write_bytes(image)
+    partial.replace(IMAGE_CACHE)
+    return image
 
 
 async def main():
@@ -30,39 +54,27 @@ async def main():
     Instead of a simple string, you can provide ChatMessage objects with
     multiple content types including images.
     """
-    # Get environment variables
-    endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
-    deployment_name = os.getenv("AZURE_OPENAI_CHAT_DEPLOYMENT_NAME")
+    # Create the agent
+    agent = build_agent("You are good at telling jokes.", "Joker")
 
-    if not endpoint or not deployment_name:
-        print("Error: Please set AZURE_OPENAI_ENDPOINT and AZURE_OPENAI_CHAT_DEPLOYMENT_NAME in .env file")
-        return
+    try:
+        # Load the image without blocking the event loop
+        image = await asyncio.to_thread(load_image)
 
-    # Create the agent
-    agent = AzureOpenAIChatClient(
-        endpoint=endpoint,
-        deployment_name=deployment_name,
-        credential=AzureCliCredential()
-    ).create_agent(
-        instructions="You are good at telling jokes.",
-        name="Joker"
-    )
-
-    # Create a message with text and image content
-    message = ChatMessage(
-        role=Role.USER,
-        contents=[
-            TextContent(text="Tell me a joke about this image?"),
-            UriContent(
-                uri="https://upload.wikimedia.org/wikipedia/commons/1/11/Joseph_Grimaldi.jpg",
-                media_type="image/jpeg"
-            )
-        ]
-    )
-
-    # Run the agent with the ChatMessage
-    result = await agent.run(message)
-    print(result.text)
+        # Create a message with text and image content
+        message = ChatMessage(
+            role=Role.USER,
+            contents=[
+                TextContent(text="Tell me a joke about this image?"),
+                DataContent(data=image, media_type="image/jpeg")
+            ]
+        )
+
+        # Run the agent with the ChatMessage
+        result = await agent.run(message)
+        print(result.text)
+    finally:
+        await close_chat_clients()
 
 
 if __name__ == "__main__":